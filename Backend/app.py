@@ -6,10 +6,13 @@ import numpy as np
 import faiss
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import re
 import math
 import glob
+import gzip
+import hashlib
+import threading
 import pypdf  # --- NEW: Using pypdf instead of fitz
 from sentence_transformers import SentenceTransformer
 
@@ -35,9 +38,21 @@ food_exercise_data = []
 pdf_index = None
 pdf_data = []
 
-
-# --- 3. HELPER FUNCTIONS (File I/O & Calculations) ---
-# (All these functions are unchanged)
+# Response cache for the polled endpoints (/check_status, /get_summary).
+# Each data source carries a version that is bumped on every save, so a cached
+# response is only reused while the data it was built from is unchanged.
+# Last-Modified stamps start at startup time (not the file mtimes) so that after
+# a restart we never hand out a stamp older than one a client already holds.
+# The cache keeps only the latest entry per endpoint, so it can't grow unbounded.
+GZIP_MIN_SIZE = 1024  # bytes; smaller payloads aren't worth compressing
+cache_lock = threading.Lock()
+data_versions = {"profile": 0, "meals": 0}
+_startup_time = datetime.now(timezone.utc).replace(microsecond=0)
+data_last_modified = {"profile": _startup_time, "meals": _startup_time}
+response_cache = {}
+
+
+# --- 3. HELPER FUNCTIONS (File I/O, Response Cache & Calculations) ---
 def load_user_profile():
     if os.path.exists(USER_PROFILE_FILE):
         with open(USER_PROFILE_FILE, 'r', encoding='utf-8') as f:
@@ -47,6 +62,7 @@ def load_user_profile():
 def save_user_profile(data):
     with open(USER_PROFILE_FILE, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=4)
+    bump_data_version("profile")
 
 def load_meal_logs():
     if os.path.exists(MEAL_LOGS_FILE):
@@ -57,6 +73,7 @@ def load_meal_logs():
 def save_meal_logs(logs):
     with open(MEAL_LOGS_FILE, 'w', encoding='utf-8') as f:
         json.dump(logs, f, ensure_ascii=False, indent=4)
+    bump_data_version("meals")
 
 def add_meal_to_log(meal_entry, date_str):
     logs = load_meal_logs()
@@ -76,6 +93,63 @@ def get_macros_for_date(date_str):
         total_macros[key] = round(total_macros[key], 2)
     return total_macros
 
+def _http_now():
+    """Current UTC time truncated to whole seconds, the precision of HTTP dates."""
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+def bump_data_version(source):
+    """Marks 'profile' or 'meals' as changed and drops the cached responses."""
+    with cache_lock:
+        data_versions[source] += 1
+        # HTTP dates only have one-second precision, so all sources share one clock
+        # that strictly increases in whole seconds. Otherwise two saves within the
+        # same second (or to different sources) could leave the Last-Modified of a
+        # response unchanged and an If-Modified-Since poll would get a stale 304.
+        latest = max(data_last_modified.values())
+        data_last_modified[source] = max(_http_now(), latest + timedelta(seconds=1))
+        response_cache.clear()
+
+def cached_json_response(endpoint, sources, build_payload, variant=None):
+    """
+    Serves a JSON payload from the response cache, rebuilding it only when one
+    of its data sources (or the requested variant, e.g. a date) has changed.
+    Adds ETag/Last-Modified headers, answers conditional requests with 304 and
+    gzips large bodies when the client allows it.
+    """
+    with cache_lock:
+        versions = tuple(data_versions[s] for s in sources)
+        last_modified = max(data_last_modified[s] for s in sources)
+        entry = response_cache.get(endpoint)
+    if entry is None or entry["versions"] != versions or entry["variant"] != variant:
+        body = jsonify(build_payload()).get_data()
+        entry = {
+            "versions": versions,
+            "variant": variant,
+            "body": body,
+            "gzip_body": gzip.compress(body) if len(body) >= GZIP_MIN_SIZE else None,
+            "etag": hashlib.sha1(body).hexdigest(),
+            "last_modified": last_modified,
+        }
+        with cache_lock:
+            # Don't store a payload if a save happened while it was being built
+            if tuple(data_versions[s] for s in sources) == versions:
+                response_cache[endpoint] = entry
+
+    if entry["gzip_body"] is not None and request.accept_encodings["gzip"] > 0:
+        response = app.response_class(entry["gzip_body"], mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(entry["etag"] + "-gzip")
+    else:
+        response = app.response_class(entry["body"], mimetype="application/json")
+        response.set_etag(entry["etag"])
+    response.vary.add("Accept-Encoding")
+    # Bursts of saves can push the shared clock ahead of real time; never send a
+    # Last-Modified from the future, clients fall back to the ETag meanwhile.
+    if entry["last_modified"] <= _http_now():
+        response.last_modified = entry["last_modified"]
+    response.cache_control.no_cache = True  # always revalidate, the 304 is cheap
+    return response.make_conditional(request)
+
 def calculate_bmi(weight_kg, height_cm):
     try:
         w = float(weight_kg)
@@ -423,8 +497,11 @@ def generate_plans_from_profile(profile):
 
 @app.route("/check_status", methods=["GET"])
 def check_status():
-    profile = load_user_profile()
-    return jsonify(profile)
+    return cached_json_response(
+        "check_status",
+        ["profile"],
+        load_user_profile
+    )
 
 @app.route("/save_profile", methods=["POST"])
 def save_profile():
@@ -580,20 +657,32 @@ def chat():
 @app.route("/get_summary", methods=["GET"])
 def get_summary():
     date_str = request.args.get('date', datetime.now().strftime('%Y-%m-%d'))
-    profile = load_user_profile()
-    daily_total = get_macros_for_date(date_str)
-    plan_goals = profile.get("plans", {}).get("diet_plan", {})
-
-    summary = {
-        "total": daily_total,
-        "goal": {
-            "calories": plan_goals.get("daily_calories_goal", 0),
-            "protein": plan_goals.get("daily_protein_goal_g", 0),
-            "carbs": plan_goals.get("daily_carbs_goal_g", 0),
-            "fat": plan_goals.get("daily_fat_goal_g", 0),
+    try:
+        # Validate before the date is used for the response cache
+        datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({"error": "Invalid date. Please use the format YYYY-MM-DD."}), 400
+
+    def build_summary():
+        profile = load_user_profile()
+        daily_total = get_macros_for_date(date_str)
+        plan_goals = profile.get("plans", {}).get("diet_plan", {})
+        return {
+            "total": daily_total,
+            "goal": {
+                "calories": plan_goals.get("daily_calories_goal", 0),
+                "protein": plan_goals.get("daily_protein_goal_g", 0),
+                "carbs": plan_goals.get("daily_carbs_goal_g", 0),
+                "fat": plan_goals.get("daily_fat_goal_g", 0),
+            }
         }
-    }
-    return jsonify(summary)
+
+    return cached_json_response(
+        "get_summary",
+        ["profile", "meals"],
+        build_summary,
+        variant=date_str
+    )
 
 # --- 7. MAIN EXECUTION ---
 if __name__ == "__main__":
@@ -1,4 +1,9 @@
+import gzip
 import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from werkzeug.http import http_date
+import app as app_module
 from app import generate_plans_from_profile # Import the complex function
 
 # This is a 'fixture' that provides sample data for our tests
@@ -59,4 +64,134 @@ def test_generate_plans_from_profile(mocker, sample_profile):
     assert result["diet_plan"]["daily_calories_goal"] == 3000
     assert result["workout_plan"][0]["exercises"][0]["name"] == "Barbell Bench Press"
     # Check that the data from our mock find_exercise_data was added
-    assert result["workout_plan"][0]["exercises"][0]["youtube_link"] == "http://fake-youtube.com/link"
\ No newline at end of file
+    assert result["workout_plan"][0]["exercises"][0]["youtube_link"] == "http://fake-youtube.com/link"
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """A Flask test client that reads/writes throwaway profile and meal files."""
+    monkeypatch.setattr(app_module, "USER_PROFILE_FILE", str(tmp_path / "user_profile.json"))
+    monkeypatch.setattr(app_module, "MEAL_LOGS_FILE", str(tmp_path / "meal_logs.json"))
+    monkeypatch.setattr(app_module, "data_versions", {"profile": 0, "meals": 0})
+    startup = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(app_module, "data_last_modified", {"profile": startup, "meals": startup})
+    monkeypatch.setattr(app_module, "response_cache", {})
+    return app_module.app.test_client()
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freezes the server's HTTP clock; set clock["now"] to move it."""
+    state = {"now": datetime(2025, 1, 1, 13, 0, 0, tzinfo=timezone.utc)}
+    monkeypatch.setattr(app_module, "_http_now", lambda: state["now"])
+    return state
+
+def test_check_status_conditional_get(client, sample_profile):
+    """Polling with a matching ETag gets a 304 until the profile is saved again."""
+    app_module.save_user_profile(sample_profile)
+
+    first = client.get("/check_status")
+    assert first.status_code == 200
+    assert first.get_json()["name"] == "Irfab"
+    assert first.headers["Last-Modified"]
+
+    etag = first.headers["ETag"]
+    repeat = client.get("/check_status", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.get_data() == b""
+
+    # Saving the profile must invalidate the cached response
+    app_module.save_user_profile({**sample_profile, "weight_kg": "70"})
+    changed = client.get("/check_status", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.get_json()["weight_kg"] == "70"
+
+def test_get_summary_invalidated_by_new_meal(client, sample_profile):
+    """Logging a meal changes the summary's ETag and totals."""
+    app_module.save_user_profile(sample_profile)
+    first = client.get("/get_summary?date=2025-01-01")
+    assert first.get_json()["total"]["calories"] == 0
+
+    app_module.add_meal_to_log({"time": "12:00", "name": "닭가슴살", "weight": 200,
+                                "macros": {"calories": 330, "protein": 62, "carbs": 0, "fat": 7}},
+                               "2025-01-01")
+    second = client.get("/get_summary?date=2025-01-01",
+                        headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.get_json()["total"]["calories"] == 330
+
+def test_large_payload_is_gzipped(client, sample_profile):
+    """Big profiles (e.g. with a full plan) are sent gzip-compressed when accepted."""
+    app_module.save_user_profile({**sample_profile, "plans": {"notes": "x" * 5000}})
+
+    response = client.get("/check_status", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.get_data()))["plans"]["notes"] == "x" * 5000
+
+def test_check_status_if_modified_since_after_quick_saves(client, clock, sample_profile):
+    """Two saves within the same second must still invalidate an If-Modified-Since poll."""
+    app_module.save_user_profile(sample_profile)
+    first = client.get("/check_status")
+
+    app_module.save_user_profile({**sample_profile, "weight_kg": "70"})
+    # The second save is stamped a second ahead, so Last-Modified is held back until then
+    assert "Last-Modified" not in client.get("/check_status").headers
+    clock["now"] += timedelta(seconds=1)
+    second = client.get("/check_status", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert second.status_code == 200
+    assert second.get_json()["weight_kg"] == "70"
+
+    repeat = client.get("/check_status", headers={"If-Modified-Since": second.headers["Last-Modified"]})
+    assert repeat.status_code == 304
+
+def test_gzip_etag_revalidation_and_declined_gzip(client, sample_profile):
+    """The gzip variant revalidates with its own ETag; gzip;q=0 gets the plain body."""
+    app_module.save_user_profile({**sample_profile, "plans": {"notes": "x" * 5000}})
+
+    zipped = client.get("/check_status", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["ETag"].endswith('-gzip"')
+    repeat = client.get("/check_status", headers={"Accept-Encoding": "gzip",
+                                                  "If-None-Match": zipped.headers["ETag"]})
+    assert repeat.status_code == 304
+
+    for accept in ("gzip;q=0", "identity"):
+        plain = client.get("/check_status", headers={"Accept-Encoding": accept})
+        assert "Content-Encoding" not in plain.headers
+        assert plain.get_json()["plans"]["notes"] == "x" * 5000
+
+def test_get_summary_rejects_invalid_date(client):
+    """Made-up dates are rejected instead of filling the response cache."""
+    response = client.get("/get_summary?date=not-a-date")
+    assert response.status_code == 400
+    assert app_module.response_cache == {}
+
+def test_get_summary_if_modified_since_across_sources(client, clock, sample_profile):
+    """A meal saved in the same second as a profile save still changes Last-Modified."""
+    app_module.add_meal_to_log({"time": "12:00", "name": "밥", "weight": 100,
+                                "macros": {"calories": 100}}, "2025-01-01")
+    clock["now"] += timedelta(seconds=1)
+    app_module.save_user_profile(sample_profile)
+    first = client.get("/get_summary?date=2025-01-01")
+    assert first.get_json()["total"]["calories"] == 100
+
+    app_module.add_meal_to_log({"time": "12:01", "name": "밥", "weight": 50,
+                                "macros": {"calories": 50}}, "2025-01-01")
+    clock["now"] += timedelta(seconds=1)
+    second = client.get("/get_summary?date=2025-01-01",
+                        headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert second.status_code == 200
+    assert second.get_json()["total"]["calories"] == 150
+
+def test_last_modified_after_restart_is_not_older_than_sent(client, clock, sample_profile):
+    """Stamps start at startup time, so a save after a restart beats any stamp already sent."""
+    sent = clock["now"] - timedelta(seconds=1)
+    app_module.data_last_modified.update(profile=clock["now"], meals=clock["now"])  # fresh process
+    app_module.save_user_profile(sample_profile)
+    clock["now"] += timedelta(seconds=1)
+    response = client.get("/check_status", headers={"If-Modified-Since": http_date(sent)})
+    assert response.status_code == 200
+
+def test_get_summary_cache_keeps_one_entry(client, sample_profile):
+    """Polling many dates doesn't grow the response cache."""
+    app_module.save_user_profile(sample_profile)
+    for day in range(1, 29):
+        assert client.get(f"/get_summary?date=2025-02-{day:02d}").status_code == 200
+    assert len(app_module.response_cache) == 1